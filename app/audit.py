@@ -0,0 +1,294 @@
+"""
+Append-only audit log of grammar checks
+
+Requests hand records to ``AuditWriter.record``, which never blocks: records
+are sampled, queued in a bounded queue and dropped according to the drop
+policy when the queue is full. A background task batches queued records and
+writes them on a single worker thread to a sink, either size-rotated JSONL
+files or a SQLite database (chosen by the ``audit_path`` extension).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from .config import Settings
+from .models import GrammarIssue
+
+logger = logging.getLogger(__name__)
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+
+class AuditRecord(BaseModel):
+    timestamp: float = Field(default_factory=time.time)
+    text: str
+    issues: List[GrammarIssue] = []
+    status: int
+    latency_ms: float
+    model: str
+    timings: Dict[str, Any] = {}
+
+
+class JsonlSink:
+    """JSON lines file rotated to ``path.1`` .. ``path.N`` once it exceeds ``max_bytes``"""
+
+    def __init__(self, path: str, max_bytes: int, backup_count: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def write(self, records: List[AuditRecord]) -> None:
+        data = "".join(record.model_dump_json() + "\n" for record in records).encode("utf-8")
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        if size and size + len(data) > self.max_bytes:
+            self.rotate()
+        with open(self.path, "ab") as fh:
+            fh.write(data)
+
+    def rotate(self) -> None:
+        if self.backup_count <= 0:
+            os.remove(self.path)
+            return
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteSink:
+    def __init__(self, path: str):
+        import sqlite3
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS audit ("
+            "id INTEGER PRIMARY KEY, timestamp REAL, status INTEGER, latency_ms REAL, "
+            "model TEXT, text TEXT, issues TEXT, timings TEXT)"
+        )
+        self.conn.commit()
+
+    def write(self, records: List[AuditRecord]) -> None:
+        self.conn.executemany(
+            "INSERT INTO audit (timestamp, status, latency_ms, model, text, issues, timings) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    record.timestamp,
+                    record.status,
+                    record.latency_ms,
+                    record.model,
+                    record.text,
+                    json.dumps([issue.model_dump() for issue in record.issues]),
+                    json.dumps(record.timings),
+                )
+                for record in records
+            ],
+        )
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def open_sink(settings: Settings):
+    if settings.audit_path.endswith(SQLITE_SUFFIXES):
+        return SqliteSink(settings.audit_path)
+    return JsonlSink(settings.audit_path, settings.audit_max_bytes, settings.audit_backup_count)
+
+
+def read_records(path: str) -> Iterator[AuditRecord]:
+    """Yield captured records oldest first, from SQLite or rotated JSONL files"""
+    if path.endswith(SQLITE_SUFFIXES):
+        import sqlite3
+
+        conn = sqlite3.connect(path)
+        try:
+            rows = conn.execute(
+                "SELECT timestamp, status, latency_ms, model, text, issues, timings "
+                "FROM audit ORDER BY timestamp, id"
+            )
+            for timestamp, status, latency_ms, model, text, issues, timings in rows:
+                yield AuditRecord(
+                    timestamp=timestamp,
+                    status=status,
+                    latency_ms=latency_ms,
+                    model=model,
+                    text=text,
+                    issues=json.loads(issues),
+                    timings=json.loads(timings),
+                )
+        finally:
+            conn.close()
+        return
+
+    backups = []
+    index = 1
+    while os.path.exists(f"{path}.{index}"):
+        backups.append(f"{path}.{index}")
+        index += 1
+    for name in list(reversed(backups)) + [path]:
+        if not os.path.exists(name):
+            continue
+        with open(name, encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    yield AuditRecord.model_validate_json(line)
+
+
+class AuditWriter:
+    """Batched background writer.
+
+    ``open_sink`` is called by ``start()`` and the sink is closed by
+    ``stop()``, so nothing is opened until the writer runs and a stopped
+    writer can be started again.
+    """
+
+    def __init__(
+        self,
+        open_sink: Callable[[], Any],
+        queue_size: int = 1000,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        sample_rate: float = 1.0,
+        drop_policy: str = "drop_newest",
+    ):
+        self.open_sink = open_sink
+        self.sink = None
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sample_rate = sample_rate
+        self.drop_policy = drop_policy
+        self.written = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._batch: List[AuditRecord] = []
+        self._inflight: Optional[Future] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "AuditWriter":
+        return cls(
+            lambda: open_sink(settings),
+            queue_size=settings.audit_queue_size,
+            batch_size=settings.audit_batch_size,
+            flush_interval=settings.audit_flush_interval,
+            sample_rate=settings.audit_sample_rate,
+            drop_policy=settings.audit_drop_policy,
+        )
+
+    async def start(self) -> None:
+        if self._task is not None:
+            raise RuntimeError("AuditWriter is already running")
+        self.sink = self.open_sink()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audit")
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._task = asyncio.create_task(self._run())
+
+    def record(self, **fields: Any) -> bool:
+        """Queue an ``AuditRecord`` built from ``fields`` without blocking.
+
+        The record is only built if it survives sampling. Returns False if it
+        was sampled out, dropped, or the writer is not running.
+        """
+        if not self._sampled():
+            return False
+        return self._enqueue(AuditRecord(**fields))
+
+    def _sampled(self) -> bool:
+        if self._queue is None:
+            return False
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            self.sampled_out += 1
+            return False
+        return True
+
+    def _enqueue(self, record: AuditRecord) -> bool:
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.drop_policy != "drop_oldest":
+                return False
+            self._queue.get_nowait()
+            self._queue.put_nowait(record)
+        return True
+
+    async def stop(self) -> None:
+        """Stop the background task and flush everything still queued"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        if self._inflight is not None:
+            await self._wait(self._inflight)
+
+        remaining, self._batch = self._batch, []
+        while self._queue is not None and not self._queue.empty():
+            remaining.append(self._queue.get_nowait())
+        self._queue = None
+        for start in range(0, len(remaining), self.batch_size):
+            await self._wait(self._executor.submit(self._write_batch, remaining[start:start + self.batch_size]))
+
+        if self._executor is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+            self._executor = None
+        if self.sink is not None:
+            self.sink.close()
+            self.sink = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch.append(await self._queue.get())
+            deadline = loop.time() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    self._batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            batch, self._batch = self._batch, []
+            # The single worker thread keeps batches in order; if we are
+            # cancelled while waiting, stop() collects the in-flight write
+            await self._wait(self._executor.submit(self._write_batch, batch))
+
+    async def _wait(self, future: Future) -> None:
+        """Await a batch write and update the counters on the event loop"""
+        self._inflight = future
+        written, failed = await asyncio.shield(asyncio.wrap_future(future))
+        self._inflight = None
+        self.written += written
+        self.dropped += failed
+
+    def _write_batch(self, batch: List[AuditRecord]) -> Tuple[int, int]:
+        """Runs on the worker thread; returns (written, failed) for the loop to count"""
+        try:
+            self.sink.write(batch)
+            return len(batch), 0
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} audit records: {e}")
+            return 0, len(batch)
@@ -0,0 +1,93 @@
+"""
+Negotiated gzip/brotli response compression
+
+Brotli is used when the optional ``brotli`` package is installed and the
+client prefers it; gzip otherwise. Responses are buffered before encoding,
+which suits the small JSON bodies this API returns. Bodies under
+``minimum_size`` bytes are sent as-is.
+"""
+
+import gzip
+import importlib.util
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .wire import parse_quality_list
+
+
+def brotli_available() -> bool:
+    return importlib.util.find_spec("brotli") is not None
+
+
+def choose_encoding(accept_encoding: Optional[str], supported: List[str]) -> Optional[str]:
+    """Pick the best encoding from ``supported`` (in server preference order)"""
+    offered = parse_quality_list(accept_encoding)
+    best, best_quality = None, 0.0
+    for encoding in supported:
+        quality = next((q for value, q in offered if value == encoding), None)
+        if quality is None:
+            quality = next((q for value, q in offered if value == "*"), 0.0)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.encodings = (["br"] if brotli_available() else []) + ["gzip"]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"), self.encodings)
+        if encoding is None:
+            async def identity_send(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+                await send(message)
+
+            await self.app(scope, receive, identity_send)
+            return
+
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+
+        async def buffered_send(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if len(body) >= self.minimum_size and "content-encoding" not in headers:
+                body = self.compress(encoding, body)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, buffered_send)
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "br":
+            import brotli
+
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
@@ -0,0 +1,86 @@
+"""
+Typed settings for the Grammar Check API
+"""
+
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+ENV_PREFIX = "GRAMMAR_"
+SETTINGS_FILE_ENV = "GRAMMAR_SETTINGS_FILE"
+
+
+class Settings(BaseModel):
+    """Runtime configuration, read from a JSON file and/or GRAMMAR_* env vars"""
+
+    model_config = ConfigDict(extra="forbid")
+
+    ollama_url: str = "http://localhost:11434"
+    model: str = "gemma3:1b"
+    max_text_length: int = Field(default=5000, gt=0)
+    ollama_timeout: float = Field(default=120, gt=0)
+    health_timeout: float = Field(default=5, gt=0)
+    ws_debounce_ms: int = Field(default=300, ge=0)
+    ws_max_concurrent_checks: int = Field(default=2, gt=0)
+    ws_chunk_chars: int = Field(default=1500, gt=0)
+    compression_min_size: int = Field(default=500, ge=0)
+    audit_path: Optional[str] = None
+    audit_sample_rate: float = Field(default=1.0, ge=0, le=1)
+    audit_queue_size: int = Field(default=1000, gt=0)
+    audit_batch_size: int = Field(default=100, gt=0)
+    audit_flush_interval: float = Field(default=1.0, gt=0)
+    audit_drop_policy: Literal["drop_newest", "drop_oldest"] = "drop_newest"
+    audit_max_bytes: int = Field(default=10 * 1024 * 1024, gt=0)
+    audit_backup_count: int = Field(default=5, ge=0)
+    log_level: Literal["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"] = "INFO"
+    cors_origins: List[str] = ["*"]
+
+    @field_validator("log_level", mode="before")
+    @classmethod
+    def normalize_log_level(cls, value: Any) -> Any:
+        return value.upper() if isinstance(value, str) else value
+
+    @classmethod
+    def from_env(cls, env: Optional[Dict[str, str]] = None) -> "Settings":
+        """Build settings from an optional JSON file, overridden by env vars.
+
+        ``GRAMMAR_SETTINGS_FILE`` points at a JSON object of field values;
+        each field can then be overridden with ``GRAMMAR_<FIELD>``, e.g.
+        ``GRAMMAR_OLLAMA_URL`` or ``GRAMMAR_MAX_TEXT_LENGTH``. List fields
+        take a comma separated value.
+        """
+        env = os.environ if env is None else env
+        values: Dict[str, Any] = {}
+
+        path = env.get(SETTINGS_FILE_ENV)
+        if path:
+            with open(path, encoding="utf-8") as fh:
+                values.update(json.load(fh))
+
+        for name, field in cls.model_fields.items():
+            raw = env.get(ENV_PREFIX + name.upper())
+            if raw is None:
+                continue
+            if field.annotation == List[str]:
+                values[name] = [item.strip() for item in raw.split(",") if item.strip()]
+            else:
+                values[name] = raw
+
+        return cls(**values)
+
+    @property
+    def generate_url(self) -> str:
+        return f"{self.ollama_url.rstrip('/')}/api/generate"
+
+    @property
+    def tags_url(self) -> str:
+        return f"{self.ollama_url.rstrip('/')}/api/tags"
+
+
+@lru_cache()
+def get_settings() -> Settings:
+    """Process-wide settings, read once from the environment"""
+    return Settings.from_env()
@@ -1,17 +1,22 @@
 import logging
-from typing import List
+from typing import Any, Dict, List, Optional
+from .config import Settings
 from .ollama_client import query_ollama
 from .models import GrammarIssue
 from .exceptions import GrammarCheckError
 
 logger = logging.getLogger(__name__)
 
-async def check_grammar(text: str) -> List[GrammarIssue]:
+async def check_grammar(
+    text: str,
+    settings: Optional[Settings] = None,
+    timings: Optional[Dict[str, Any]] = None,
+) -> List[GrammarIssue]:
     if not text or not text.strip():
         return []
     
     try:
-        issues_data = await query_ollama(text)
+        issues_data = await query_ollama(text, settings, timings)
         
         if not issues_data:
             return []
@@ -1,7 +1,17 @@
-from fastapi import FastAPI, HTTPException
+import json
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, FastAPI, Header, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from .models import GrammarCheckRequest, GrammarCheckResponse, HealthResponse
+from . import __version__
+from .compression import CompressionMiddleware
+from .config import Settings, get_settings
+from .models import GrammarCheckRequest, GrammarCheckResponse, GrammarIssue, HealthResponse
 from .grammar import check_grammar
+from .ollama_client import ping_ollama
+from .session import EditorSession
+from .wire import JSON, negotiate_format, render_issues
 from .exceptions import (
     GrammarCheckError,
     OllamaConnectionError,
@@ -11,54 +21,78 @@ from .exceptions import (
     TextTooLongError,
     InvalidInputError
 )
-import httpx
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(
-    title="Grammar Check API",
-    version="1.0.0",
-    description="Simple grammar checking service using Ollama"
-)
+router = APIRouter()
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+def app_settings(request: Request) -> Settings:
+    return request.app.state.settings
 
-@app.get("/health")
-async def health_check():
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get("http://localhost:11434/api/tags", timeout=5)
-            ollama_connected = response.status_code == 200
-    except:
-        ollama_connected = False
+def app_audit(request: Request):
+    return request.app.state.audit
+
+@router.get("/health")
+async def health_check(settings: Settings = Depends(app_settings)):
+    ollama_connected = await ping_ollama(settings)
     
     return HealthResponse(
         status="healthy" if ollama_connected else "degraded",
         ollama_connected=ollama_connected
     )
 
-@app.post("/check")
-async def grammar_check(request: GrammarCheckRequest):
+@router.post("/check")
+async def grammar_check(
+    request: GrammarCheckRequest,
+    response: Response,
+    accept: Optional[str] = Header(None),
+    settings: Settings = Depends(app_settings),
+    audit=Depends(app_audit),
+):
+    started = time.perf_counter()
+    timings: Dict[str, Any] = {}
+
+    def record(issues: List[GrammarIssue], status: int):
+        if audit is not None:
+            audit.record(
+                text=request.text,
+                issues=issues,
+                status=status,
+                latency_ms=(time.perf_counter() - started) * 1000,
+                model=settings.model,
+                timings=timings,
+            )
+
+    # Only completed checks are recorded; a cancelled request has no outcome
+    # worth replaying
     try:
-        if not request.text or not request.text.strip():
+        issues = await run_grammar_check(request.text, settings, timings)
+    except HTTPException as e:
+        record([], e.status_code)
+        raise
+    record(issues, 200)
+
+    media_type = negotiate_format(accept)
+    if media_type != JSON:
+        return render_issues(media_type, request.text, issues)
+    response.headers["Vary"] = "Accept"
+    return GrammarCheckResponse(issues=issues)
+
+async def run_grammar_check(text: str, settings: Settings, timings: Dict[str, Any]) -> List[GrammarIssue]:
+    try:
+        if not text or not text.strip():
             raise InvalidInputError("Text cannot be empty")
         
-        if len(request.text) > 5000:
-            raise TextTooLongError("Text too long (max 5000 characters)")
+        if len(text) > settings.max_text_length:
+            raise TextTooLongError(f"Text too long (max {settings.max_text_length} characters)")
         
-        logger.info(f"Checking grammar for text: {request.text[:50]}...")
+        logger.info(f"Checking grammar for text: {text[:50]}...")
         
-        issues = await check_grammar(request.text)
+        issues = await check_grammar(text, settings, timings)
         
         logger.info(f"Found {len(issues)} grammar issues")
-        return GrammarCheckResponse(issues=issues)
+        return issues
         
     except InvalidInputError as e:
         logger.error(f"Invalid input: {e}")
@@ -94,6 +128,69 @@ async def grammar_check(request: GrammarCheckRequest):
             detail="Internal server error. Please check the server logs for more details."
         )
 
-@app.get("/")
+@router.websocket("/ws/check")
+async def grammar_check_session(websocket: WebSocket):
+    await websocket.accept()
+    session = EditorSession(websocket.app.state.settings, websocket.send_json)
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            try:
+                if message.get("text") is None:
+                    raise InvalidInputError("Binary frames are not supported; send JSON text")
+                session.handle(json.loads(message["text"]))
+            except (InvalidInputError, ValueError) as e:
+                logger.error(f"Invalid session message: {e}")
+                await websocket.send_json({"type": "error", "detail": str(e)})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await session.close()
+
+@router.get("/")
 async def root():
     return {"message": "Grammar Check API is running!"}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    audit = app.state.audit
+    if audit is not None:
+        await audit.start()
+    try:
+        yield
+    finally:
+        if audit is not None:
+            await audit.stop()
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    settings = settings or get_settings()
+
+    logging.basicConfig(level=settings.log_level)
+
+    app = FastAPI(
+        title="Grammar Check API",
+        version=__version__,
+        description="Simple grammar checking service using Ollama",
+        lifespan=lifespan,
+    )
+    app.state.settings = settings
+    app.state.audit = None
+    if settings.audit_path:
+        from .audit import AuditWriter
+
+        app.state.audit = AuditWriter.from_settings(settings)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_min_size)
+
+    app.include_router(router)
+    return app
+
+app = create_app()
@@ -1,7 +1,7 @@
 import json
 import logging
-import httpx
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from .config import Settings, get_settings
 from .exceptions import (
     OllamaConnectionError, 
     OllamaTimeoutError, 
@@ -30,19 +30,37 @@ Return JSON like this:
 Important: Use the exact wrong phrases from the text, not "incorrect text".
 """
 
-async def query_ollama(text: str) -> list[dict]:
+OLLAMA_TIMING_FIELDS = (
+    "total_duration",
+    "load_duration",
+    "prompt_eval_count",
+    "prompt_eval_duration",
+    "eval_count",
+    "eval_duration",
+)
+
+async def query_ollama(
+    text: str,
+    settings: Optional[Settings] = None,
+    timings: Optional[Dict[str, Any]] = None,
+) -> list[dict]:
+    # httpx is only needed once a request is made, keep it off the import path
+    import httpx
+
+    settings = settings or get_settings()
+
     if not text or not text.strip():
         logger.error("Empty or invalid text provided")
         return []
     
-    if len(text) > 5000:
+    if len(text) > settings.max_text_length:
         logger.warning(f"Text too long ({len(text)} chars), truncating")
-        text = text[:5000]
+        text = text[:settings.max_text_length]
     
     prompt = PROMPT_TEMPLATE.format(text=text)
     
     payload = {
-        "model": "gemma3:1b",
+        "model": settings.model,
         "prompt": prompt,
         "stream": False
     }
@@ -52,9 +70,9 @@ async def query_ollama(text: str) -> list[dict]:
             logger.info("Sending request to Ollama...")
             
             response = await client.post(
-                "http://localhost:11434/api/generate",
+                settings.generate_url,
                 json=payload,
-                timeout=120
+                timeout=settings.ollama_timeout
             )
             
             if response.status_code != 200:
@@ -64,16 +82,19 @@ async def query_ollama(text: str) -> list[dict]:
             data = response.json()
             generated_text = data.get("response", "")
             
+            if timings is not None:
+                timings.update({key: data[key] for key in OLLAMA_TIMING_FIELDS if key in data})
+            
             logger.info("Got response from Ollama")
             
             return parse_response(generated_text)
             
     except httpx.ConnectError:
         logger.error("Cannot connect to Ollama. Make sure it's running.")
-        raise OllamaConnectionError("Cannot connect to Ollama. Make sure it's running on localhost:11434")
+        raise OllamaConnectionError(f"Cannot connect to Ollama. Make sure it's running on {settings.ollama_url}")
     except httpx.TimeoutException:
         logger.error("Request timed out")
-        raise OllamaTimeoutError("Request to Ollama timed out after 120 seconds")
+        raise OllamaTimeoutError(f"Request to Ollama timed out after {settings.ollama_timeout:g} seconds")
     except OllamaResponseError:
         raise
     except Exception as e:
@@ -113,14 +134,29 @@ def parse_response(text: str) -> list[dict]:
         logger.error(f"Error parsing response: {e}")
         raise InvalidResponseError(f"Error parsing Ollama response: {str(e)}")
 
-async def check_ollama_health() -> bool:
+async def fetch_tags(settings: Settings) -> Optional[Dict[str, Any]]:
+    """GET the Ollama tags endpoint; None if Ollama is unreachable or errors"""
+    import httpx
+
     try:
         async with httpx.AsyncClient() as client:
-            response = await client.get("http://localhost:11434/api/tags", timeout=5)
+            response = await client.get(settings.tags_url, timeout=settings.health_timeout)
             if response.status_code == 200:
-                models = response.json()
-                available_models = [model['name'] for model in models.get('models', [])]
-                return 'gemma3:1b' in available_models
-            return False
+                return response.json()
+            return None
+    except Exception:
+        return None
+
+async def ping_ollama(settings: Optional[Settings] = None) -> bool:
+    return await fetch_tags(settings or get_settings()) is not None
+
+async def check_ollama_health(settings: Optional[Settings] = None) -> bool:
+    settings = settings or get_settings()
+    tags = await fetch_tags(settings)
+    if tags is None:
+        return False
+    try:
+        available_models = [model['name'] for model in tags.get('models', [])]
     except Exception:
         return False
+    return settings.model in available_models
@@ -0,0 +1,198 @@
+"""
+Live editor sessions for the /ws/check WebSocket endpoint
+
+Protocol (JSON messages):
+
+    client -> {"type": "init", "text": "..."}
+    client -> {"type": "delta", "start": 0, "end": 4, "text": "..."}
+    server -> {"type": "diff", "version": 3,
+               "added": [{"id": 7, "wrong": ..., "corrected": ..., "error_type": ...}],
+               "removed": [2, 5]}
+    server -> {"type": "error", "detail": "..."}
+
+A delta replaces ``text[start:end]`` with the given text. ``start`` and
+``end`` count Unicode code points, as Python string indices do; editors
+that track UTF-16 offsets (JavaScript) must convert them first, since the
+two differ once the text contains characters outside the BMP.
+
+Edits are debounced; a newer edit cancels the pending or in-flight check.
+The document is split into paragraphs (separated by blank lines), and
+changed paragraphs are sent to the model grouped into chunks of up to
+``ws_chunk_chars`` characters, with at most ``ws_max_concurrent_checks``
+model calls in flight. Results are cached per chunk, so editing any
+paragraph of a chunk re-checks all of it. A diff is sent after every
+completed check, possibly with empty lists.
+"""
+
+import asyncio
+import logging
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .config import Settings
+from .exceptions import GrammarCheckError, InvalidInputError, TextTooLongError
+from .grammar import check_grammar
+from .models import GrammarIssue
+
+logger = logging.getLogger(__name__)
+
+IssueKey = Tuple[str, str, str, int]
+Checker = Callable[[str, Settings], Awaitable[List[GrammarIssue]]]
+
+
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+CHUNK_SEPARATOR = "\n\n"
+
+
+def split_regions(text: str) -> List[str]:
+    """Split a document into independently checked regions (paragraphs)"""
+    return [paragraph for paragraph in PARAGRAPH_BREAK.split(text) if paragraph.strip()]
+
+
+def chunk_regions(regions: List[str], max_chars: int) -> List[List[str]]:
+    """Group regions, in order, into chunks of at most ``max_chars`` characters.
+
+    A region longer than ``max_chars`` gets a chunk of its own.
+    """
+    chunks: List[List[str]] = []
+    size = 0
+    for region in regions:
+        if chunks and size + len(CHUNK_SEPARATOR) + len(region) <= max_chars:
+            chunks[-1].append(region)
+            size += len(CHUNK_SEPARATOR) + len(region)
+        else:
+            chunks.append([region])
+            size = len(region)
+    return chunks
+
+
+class EditorSession:
+    def __init__(
+        self,
+        settings: Settings,
+        send: Callable[[Dict[str, Any]], Awaitable[None]],
+        checker: Checker = check_grammar,
+    ):
+        self.settings = settings
+        self.text = ""
+        self.version = 0
+        self._send = send
+        self._checker = checker
+        self._chunk_issues: Dict[Tuple[str, ...], List[GrammarIssue]] = {}
+        self._published: Dict[IssueKey, int] = {}
+        self._next_id = 1
+        self._pending: Optional[asyncio.Task] = None
+        self._limit = asyncio.Semaphore(settings.ws_max_concurrent_checks)
+
+    def handle(self, message: Dict[str, Any]) -> None:
+        """Apply a client message to the document and schedule a check"""
+        if not isinstance(message, dict):
+            raise InvalidInputError("Message must be a JSON object")
+
+        kind = message.get("type")
+        if kind == "init":
+            text = message.get("text")
+            if not isinstance(text, str):
+                raise InvalidInputError("init requires a text string")
+            self.text = text
+        elif kind == "delta":
+            self.apply_delta(message.get("start"), message.get("end"), message.get("text"))
+        else:
+            raise InvalidInputError(f"Unknown message type: {kind!r}")
+
+        self.version += 1
+        self.schedule()
+
+    def apply_delta(self, start: Any, end: Any, text: Any) -> None:
+        if not isinstance(start, int) or not isinstance(end, int) or not isinstance(text, str):
+            raise InvalidInputError("delta requires integer start/end and a text string")
+        if not 0 <= start <= end <= len(self.text):
+            raise InvalidInputError(f"delta range {start}:{end} outside document of length {len(self.text)}")
+        self.text = self.text[:start] + text + self.text[end:]
+
+    def schedule(self) -> None:
+        """Cancel any pending or in-flight check and start a debounced one"""
+        if self._pending and not self._pending.done():
+            self._pending.cancel()
+        self._pending = asyncio.create_task(self._debounced_check())
+
+    async def close(self) -> None:
+        if self._pending and not self._pending.done():
+            self._pending.cancel()
+            try:
+                await self._pending
+            except asyncio.CancelledError:
+                pass
+
+    async def _debounced_check(self) -> None:
+        await asyncio.sleep(self.settings.ws_debounce_ms / 1000)
+        try:
+            try:
+                await self.check()
+            except GrammarCheckError as e:
+                logger.error(f"Session check failed: {e}")
+                await self._send({"type": "error", "detail": str(e)})
+        except Exception:
+            # Nobody awaits this task, so anything else (e.g. sending to a
+            # client that has gone away) would otherwise go unreported
+            logger.exception("Unexpected error in session check")
+
+    async def check(self) -> None:
+        """Check changed regions and push the issue diff to the client"""
+        if len(self.text) > self.settings.max_text_length:
+            raise TextTooLongError(f"Text too long (max {self.settings.max_text_length} characters)")
+
+        version = self.version
+        regions = split_regions(self.text)
+        current = set(regions)
+        self._chunk_issues = {
+            chunk: issues for chunk, issues in self._chunk_issues.items()
+            if all(region in current for region in chunk)
+        }
+        covered = {region for chunk in self._chunk_issues for region in chunk}
+        stale = [r for r in dict.fromkeys(regions) if r not in covered]
+
+        if stale:
+            chunks = chunk_regions(stale, self.settings.ws_chunk_chars)
+            logger.info(f"Checking {len(stale)} of {len(regions)} regions in {len(chunks)} chunks")
+            results = await asyncio.gather(
+                *(self._check_chunk(chunk) for chunk in chunks),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+
+        position: Dict[str, int] = {}
+        for index, region in enumerate(regions):
+            position.setdefault(region, index)
+        ordered = sorted(self._chunk_issues, key=lambda chunk: min(position[region] for region in chunk))
+        await self._publish(version, [issue for chunk in ordered for issue in self._chunk_issues[chunk]])
+
+    async def _check_chunk(self, chunk: List[str]) -> None:
+        async with self._limit:
+            issues = await self._checker(CHUNK_SEPARATOR.join(chunk), self.settings)
+
+        # Store as soon as a chunk lands so a cancelled check keeps the chunks
+        # that finished
+        self._chunk_issues[tuple(chunk)] = issues
+
+    async def _publish(self, version: int, issues: List[GrammarIssue]) -> None:
+        current: Dict[IssueKey, GrammarIssue] = {}
+        seen: Dict[Tuple[str, str, str], int] = {}
+        for issue in issues:
+            triple = (issue.wrong, issue.corrected, issue.error_type)
+            seen[triple] = seen.get(triple, 0) + 1
+            current[triple + (seen[triple],)] = issue
+
+        removed = [issue_id for key, issue_id in self._published.items() if key not in current]
+        added = []
+        for key, issue in current.items():
+            if key in self._published:
+                continue
+            self._published[key] = self._next_id
+            added.append({"id": self._next_id, **issue.model_dump()})
+            self._next_id += 1
+        self._published = {key: issue_id for key, issue_id in self._published.items() if key in current}
+
+        await self._send({"type": "diff", "version": version, "added": added, "removed": removed})
@@ -0,0 +1,121 @@
+"""
+Response formats for grammar check results
+
+``/check`` picks a format from the Accept header:
+
+- ``application/json`` (default): ``GrammarCheckResponse``
+- ``application/vnd.grammar.compact+json``: columnar JSON, see ``to_compact``
+- ``application/msgpack``: the compact form encoded with MessagePack,
+  available when the optional ``msgpack`` package is installed
+"""
+
+import importlib.util
+import json
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import Response
+
+from .models import GrammarIssue
+
+JSON = "application/json"
+COMPACT_JSON = "application/vnd.grammar.compact+json"
+MSGPACK = "application/msgpack"
+
+
+def parse_quality_list(header: Optional[str]) -> List[Tuple[str, float]]:
+    """Parse an Accept/Accept-Encoding header into (value, q) pairs, best first"""
+    items = []
+    for position, part in enumerate((header or "").split(",")):
+        fields = part.strip().split(";")
+        value = fields[0].strip().lower()
+        if not value:
+            continue
+        quality = 1.0
+        for param in fields[1:]:
+            key, _, raw = param.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(raw)
+                except ValueError:
+                    quality = 0.0
+        items.append((position, value, quality))
+    items.sort(key=lambda item: (-item[2], item[0]))
+    return [(value, quality) for _, value, quality in items]
+
+
+@lru_cache()
+def msgpack_available() -> bool:
+    return importlib.util.find_spec("msgpack") is not None
+
+
+def negotiate_format(accept: Optional[str]) -> str:
+    """Pick the response media type for an Accept header, defaulting to JSON"""
+    for media_type, quality in parse_quality_list(accept):
+        if quality <= 0:
+            continue
+        if media_type in (COMPACT_JSON, JSON):
+            return media_type
+        if media_type in (MSGPACK, "application/x-msgpack") and msgpack_available():
+            return MSGPACK
+        if media_type in ("*/*", "application/*"):
+            return JSON
+    return JSON
+
+
+def to_compact(text: str, issues: List[GrammarIssue]) -> Dict[str, Any]:
+    """Columnar form of an issue list.
+
+    Error types are interned into ``error_types`` and referenced by index.
+    ``wrong`` holds ``[start, end]`` offsets into the submitted text when the
+    phrase occurs in it verbatim, otherwise the phrase itself. Repeated
+    phrases are located in order of appearance.
+    """
+    error_types: List[str] = []
+    type_index: Dict[str, int] = {}
+    wrong: List[Any] = []
+    search_from: Dict[str, int] = {}
+
+    for issue in issues:
+        if issue.error_type not in type_index:
+            type_index[issue.error_type] = len(error_types)
+            error_types.append(issue.error_type)
+
+        start = text.find(issue.wrong, search_from.get(issue.wrong, 0)) if issue.wrong else -1
+        if start == -1:
+            wrong.append(issue.wrong)
+        else:
+            end = start + len(issue.wrong)
+            search_from[issue.wrong] = end
+            wrong.append([start, end])
+
+    return {
+        "error_types": error_types,
+        "wrong": wrong,
+        "corrected": [issue.corrected for issue in issues],
+        "error_type": [type_index[issue.error_type] for issue in issues],
+    }
+
+
+def from_compact(text: str, data: Dict[str, Any]) -> List[GrammarIssue]:
+    """Expand a compact payload back into issues"""
+    return [
+        GrammarIssue(
+            wrong=text[span[0]:span[1]] if isinstance(span, list) else span,
+            corrected=corrected,
+            error_type=data["error_types"][type_id],
+        )
+        for span, corrected, type_id in zip(data["wrong"], data["corrected"], data["error_type"])
+    ]
+
+
+def render_issues(media_type: str, text: str, issues: List[GrammarIssue]) -> Response:
+    """Encode a compact response; JSON responses go through the response model"""
+    compact = to_compact(text, issues)
+    if media_type == MSGPACK:
+        import msgpack
+
+        body = msgpack.packb(compact, use_bin_type=True)
+    else:
+        body = json.dumps(compact, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return Response(content=body, media_type=media_type, headers={"Vary": "Accept"})
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Replay captured audit log traffic against a running Grammar Check API
+
+    python run_replay.py audit.jsonl --url http://localhost:8000 --concurrency 4
+    python run_replay.py audit.db --speed 1.0   # keep the recorded pacing
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import List, Optional
+
+import httpx
+
+sys.path.append(os.path.dirname(__file__))
+
+from app.audit import AuditRecord, read_records
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def replay(
+    records: List[AuditRecord],
+    url: str,
+    concurrency: int,
+    speed: float,
+    timeout: float,
+) -> List[Optional[float]]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[Optional[float]] = [None] * len(records)
+    origin = records[0].timestamp if records else 0.0
+    started = time.perf_counter()
+
+    async with httpx.AsyncClient(base_url=url, timeout=timeout) as client:
+        async def send(index: int, record: AuditRecord):
+            if speed > 0:
+                delay = (record.timestamp - origin) / speed - (time.perf_counter() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            async with semaphore:
+                request_start = time.perf_counter()
+                try:
+                    response = await client.post("/check", json={"text": record.text})
+                except httpx.HTTPError as e:
+                    print(f"  ❌ Request {index + 1} failed: {e}")
+                    return
+                if response.status_code == record.status:
+                    latencies[index] = (time.perf_counter() - request_start) * 1000
+                else:
+                    print(f"  ❌ Request {index + 1}: status {response.status_code}, recorded {record.status}")
+
+        await asyncio.gather(*(send(index, record) for index, record in enumerate(records)))
+
+    return latencies
+
+
+def print_stats(label: str, values: List[float]):
+    if not values:
+        print(f"  {label}: no data")
+        return
+    print(f"  {label}: mean {statistics.mean(values):.1f}ms, "
+          f"median {statistics.median(values):.1f}ms, "
+          f"p95 {percentile(values, 0.95):.1f}ms, "
+          f"max {max(values):.1f}ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Replay captured grammar check traffic")
+    parser.add_argument("path", help="Audit log: JSONL file or SQLite database")
+    parser.add_argument("--url", default="http://localhost:8000", help="API base URL")
+    parser.add_argument("--concurrency", type=int, default=1, help="Maximum requests in flight")
+    parser.add_argument("--speed", type=float, default=0,
+                        help="Replay pacing relative to recorded time (0 = as fast as possible)")
+    parser.add_argument("--limit", type=int, default=None, help="Replay at most this many records")
+    parser.add_argument("--timeout", type=float, default=180, help="Per-request timeout in seconds")
+    args = parser.parse_args()
+
+    records = list(read_records(args.path))[:args.limit]
+    print("🔁 Grammar Check API Replay")
+    print("=" * 50)
+    print(f"Records: {len(records)} from {args.path}")
+    print(f"Target: {args.url} (concurrency {args.concurrency}, speed {args.speed or 'max'})")
+    if not records:
+        return
+
+    started = time.perf_counter()
+    latencies = await replay(records, args.url, args.concurrency, args.speed, args.timeout)
+    elapsed = time.perf_counter() - started
+
+    completed = [latency for latency in latencies if latency is not None]
+    print("\n📊 REPLAY METRICS:")
+    print(f"  Success Rate: {len(completed)}/{len(records)} ({len(completed) / len(records) * 100:.1f}%)")
+    print(f"  Throughput: {len(completed) / elapsed:.2f} requests/s over {elapsed:.1f}s")
+    print_stats("Replayed latency", completed)
+    print_stats("Recorded latency", [record.latency_ms for record in records])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
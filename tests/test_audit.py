@@ -0,0 +1,165 @@
+"""
+Tests for the batched audit log writer and its sinks
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.audit import AuditRecord, AuditWriter, JsonlSink, SqliteSink, read_records
+from app.models import GrammarIssue
+
+ISSUE = GrammarIssue(wrong="I goes", corrected="I go", error_type="verb tense")
+
+
+def record_fields(index):
+    return dict(text=f"text {index}", issues=[ISSUE], status=200, latency_ms=12.5, model="gemma3:1b")
+
+
+def make_record(index):
+    return AuditRecord(**record_fields(index))
+
+
+def test_writer_batches_and_flushes_on_stop(tmp_path):
+    path = str(tmp_path / "audit.jsonl")
+
+    async def scenario():
+        writer = AuditWriter(lambda: JsonlSink(path, max_bytes=10_000_000, backup_count=2), batch_size=10)
+        await writer.start()
+        for index in range(25):
+            assert writer.record(**record_fields(index))
+        await writer.stop()
+        assert not writer.record(**record_fields(25))
+        return writer
+
+    writer = asyncio.run(scenario())
+
+    assert writer.written == 25
+    assert [record.text for record in read_records(path)] == [f"text {i}" for i in range(25)]
+
+
+def test_jsonl_sink_rotates_and_reads_oldest_first(tmp_path):
+    path = str(tmp_path / "audit.jsonl")
+    sink = JsonlSink(path, max_bytes=300, backup_count=5)
+    for index in range(6):
+        sink.write([make_record(index)])
+
+    assert (tmp_path / "audit.jsonl.1").exists()
+    assert [record.text for record in read_records(path)] == [f"text {i}" for i in range(6)]
+
+
+def test_drop_policies_bound_the_queue(tmp_path):
+    async def scenario(policy):
+        writer = AuditWriter(lambda: SqliteSink(str(tmp_path / f"{policy}.db")), queue_size=3, drop_policy=policy)
+        await writer.start()
+        results = [writer.record(**record_fields(index)) for index in range(5)]
+        await writer.stop()
+        return writer, results
+
+    writer, results = asyncio.run(scenario("drop_newest"))
+    assert results == [True, True, True, False, False]
+    assert writer.dropped == 2
+    assert [r.text for r in read_records(str(tmp_path / "drop_newest.db"))] == ["text 0", "text 1", "text 2"]
+
+    writer, results = asyncio.run(scenario("drop_oldest"))
+    assert all(results)
+    assert writer.dropped == 2
+    assert [r.text for r in read_records(str(tmp_path / "drop_oldest.db"))] == ["text 2", "text 3", "text 4"]
+
+
+def test_sampling_skips_records(tmp_path):
+    async def scenario():
+        writer = AuditWriter(lambda: JsonlSink(str(tmp_path / "audit.jsonl"), 1_000_000, 1), sample_rate=0)
+        await writer.start()
+        kept = writer.record(text="x", status=200, latency_ms=1.0, model="m")
+        await writer.stop()
+        return writer, kept
+
+    writer, kept = asyncio.run(scenario())
+    assert not kept
+    assert writer.sampled_out == 1
+    assert writer.written == 0
+
+
+def test_check_endpoint_records_success_and_error(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import app.main
+    from app.config import Settings
+
+    async def fake_check_grammar(text, settings, timings=None):
+        timings.update(eval_count=7, total_duration=1000)
+        return [ISSUE]
+
+    monkeypatch.setattr(app.main, "check_grammar", fake_check_grammar)
+    path = str(tmp_path / "audit.jsonl")
+
+    with TestClient(app.main.create_app(Settings(audit_path=path))) as client:
+        assert client.post("/check", json={"text": "I goes home."}).status_code == 200
+        assert client.post("/check", json={"text": "  "}).status_code == 400
+
+    success, error = read_records(path)
+    assert (success.status, success.issues, success.timings) == (200, [ISSUE], {"eval_count": 7, "total_duration": 1000})
+    assert (error.status, error.issues, error.timings) == (400, [], {})
+
+
+def test_app_lifespan_can_run_twice(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import app.main
+    from app.config import Settings
+
+    async def fake_check_grammar(text, settings, timings=None):
+        return []
+
+    monkeypatch.setattr(app.main, "check_grammar", fake_check_grammar)
+    path = tmp_path / "audit.jsonl"
+    api = app.main.create_app(Settings(audit_path=str(path)))
+
+    assert not path.exists()
+    for text in ("first run", "second run"):
+        with TestClient(api) as client:
+            assert client.post("/check", json={"text": text}).status_code == 200
+
+    assert [record.text for record in read_records(str(path))] == ["first run", "second run"]
+
+
+def test_start_twice_fails(tmp_path):
+    async def scenario():
+        writer = AuditWriter(lambda: JsonlSink(str(tmp_path / "audit.jsonl"), 1_000_000, 1))
+        await writer.start()
+        try:
+            with pytest.raises(RuntimeError):
+                await writer.start()
+        finally:
+            await writer.stop()
+
+    asyncio.run(scenario())
+
+
+def test_stop_collects_inflight_write(tmp_path):
+    class SlowSink:
+        def __init__(self):
+            self.records = []
+
+        def write(self, records):
+            time.sleep(0.1)
+            self.records.extend(records)
+
+        def close(self):
+            pass
+
+    async def scenario():
+        sink = SlowSink()
+        writer = AuditWriter(lambda: sink, batch_size=1, flush_interval=0.01)
+        await writer.start()
+        for index in range(3):
+            writer.record(**record_fields(index))
+        await asyncio.sleep(0.05)
+        await writer.stop()
+        return writer, sink
+
+    writer, sink = asyncio.run(scenario())
+    assert [record.text for record in sink.records] == ["text 0", "text 1", "text 2"]
+    assert (writer.written, writer.dropped) == (3, 0)
@@ -0,0 +1,40 @@
+"""
+Tests for typed settings loading
+"""
+
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from app.config import Settings
+
+
+def test_env_overrides_settings_file(tmp_path):
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps({"model": "llama3.2:3b", "max_text_length": 2000}))
+
+    settings = Settings.from_env({
+        "GRAMMAR_SETTINGS_FILE": str(path),
+        "GRAMMAR_MAX_TEXT_LENGTH": "3000",
+        "GRAMMAR_LOG_LEVEL": "debug",
+        "GRAMMAR_CORS_ORIGINS": "https://a.example, https://b.example",
+    })
+
+    assert settings.model == "llama3.2:3b"
+    assert settings.max_text_length == 3000
+    assert settings.log_level == "DEBUG"
+    assert settings.cors_origins == ["https://a.example", "https://b.example"]
+
+
+def test_unknown_settings_file_key_is_rejected(tmp_path):
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps({"ollama_uri": "http://gpu:11434"}))
+
+    with pytest.raises(ValidationError):
+        Settings.from_env({"GRAMMAR_SETTINGS_FILE": str(path)})
+
+
+def test_invalid_log_level_is_rejected():
+    with pytest.raises(ValidationError):
+        Settings.from_env({"GRAMMAR_LOG_LEVEL": "verbose"})
@@ -0,0 +1,174 @@
+"""
+Tests for live editor sessions, using a fake checker instead of Ollama
+"""
+
+import asyncio
+
+from app.config import Settings
+from app.models import GrammarIssue
+from app.session import EditorSession, chunk_regions, split_regions
+
+SETTINGS = Settings(ws_debounce_ms=10)
+
+
+def make_session(settings=SETTINGS):
+    sent = []
+    checked = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def checker(text, settings):
+        checked.append(text)
+        await asyncio.sleep(0.05)
+        if "I goes" in text:
+            return [GrammarIssue(wrong="I goes", corrected="I go", error_type="verb tense")]
+        return []
+
+    return EditorSession(settings, send, checker), sent, checked
+
+
+def test_only_changed_regions_are_rechecked():
+    async def scenario():
+        # Small chunks so each paragraph is checked on its own
+        session, sent, checked = make_session(Settings(ws_debounce_ms=10, ws_chunk_chars=20))
+        session.handle({"type": "init", "text": "I goes home.\n\nAll good here."})
+        await session._pending
+
+        assert sorted(checked) == ["All good here.", "I goes home."]
+        assert [i["wrong"] for i in sent[-1]["added"]] == ["I goes"]
+        issue_id = sent[-1]["added"][0]["id"]
+
+        checked.clear()
+        session.handle({"type": "delta", "start": 2, "end": 6, "text": "go"})
+        await session._pending
+
+        assert checked == ["I go home."]
+        assert sent[-1] == {"type": "diff", "version": 2, "added": [], "removed": [issue_id]}
+
+    asyncio.run(scenario())
+
+
+def test_editing_later_paragraph_of_chunk_removes_paraphrased_issue():
+    async def scenario():
+        sent = []
+        checked = []
+
+        async def send(message):
+            sent.append(message)
+
+        async def paraphrasing_checker(text, settings):
+            checked.append(text)
+            if "She have" in text:
+                # The model does not quote the phrase verbatim
+                return [GrammarIssue(wrong="She  have", corrected="She has", error_type="subject-verb agreement")]
+            return []
+
+        session = EditorSession(SETTINGS, send, paraphrasing_checker)
+        session.handle({"type": "init", "text": "All good here.\n\nShe have a apple."})
+        await session._pending
+        issue_id = sent[-1]["added"][0]["id"]
+
+        session.handle({"type": "delta", "start": 16, "end": 33, "text": "She has an apple."})
+        await session._pending
+
+        assert checked[-1] == "All good here.\n\nShe has an apple."
+        assert sent[-1] == {"type": "diff", "version": 2, "added": [], "removed": [issue_id]}
+
+    asyncio.run(scenario())
+
+
+def test_unexpected_check_errors_are_logged(caplog):
+    async def scenario():
+        async def broken_send(message):
+            raise RuntimeError("client went away")
+
+        async def checker(text, settings):
+            return []
+
+        session = EditorSession(SETTINGS, broken_send, checker)
+        session.handle({"type": "init", "text": "Hello."})
+        await session._pending
+
+        assert session._pending.exception() is None
+
+    asyncio.run(scenario())
+    assert "client went away" in caplog.text
+
+
+def test_sentence_spanning_lines_is_one_region():
+    text = "She walked to the\nstore yesterday.\n\n  \nI goes home."
+
+    assert split_regions(text) == ["She walked to the\nstore yesterday.", "I goes home."]
+
+
+def test_chunks_respect_size_limit():
+    assert chunk_regions(["aaaa", "bbbb", "cccc"], 10) == [["aaaa", "bbbb"], ["cccc"]]
+    assert chunk_regions(["a" * 20, "b"], 10) == [["a" * 20], ["b"]]
+
+
+def test_large_document_is_chunked_and_concurrency_capped():
+    async def scenario():
+        settings = Settings(ws_debounce_ms=0, ws_max_concurrent_checks=2, ws_chunk_chars=200)
+        session, sent, checked = make_session(settings)
+        in_flight = peak = 0
+        inner = session._checker
+
+        async def tracking_checker(text, settings):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            try:
+                return await inner(text, settings)
+            finally:
+                in_flight -= 1
+
+        session._checker = tracking_checker
+        session.handle({"type": "init", "text": "\n\n".join(f"Line {i} is fine." for i in range(200))})
+        await session._pending
+
+        assert peak <= 2
+        assert len(checked) < 30
+        assert sent[-1]["type"] == "diff"
+
+    asyncio.run(scenario())
+
+
+def test_newer_edit_cancels_inflight_check():
+    async def scenario():
+        session, sent, checked = make_session()
+        session.handle({"type": "init", "text": "I goes home."})
+        await asyncio.sleep(0.02)
+        first = session._pending
+
+        session.handle({"type": "delta", "start": 0, "end": 12, "text": "Fine."})
+        await session._pending
+
+        assert first.cancelled()
+        assert len(sent) == 1
+        assert sent[0]["version"] == 2
+        assert sent[0]["added"] == []
+        await session.close()
+
+    asyncio.run(scenario())
+
+
+def test_websocket_answers_binary_and_invalid_frames(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.main import create_app
+
+    async def checker(text, settings):
+        return []
+
+    # The endpoint builds sessions with the default checker; swap it for the stub
+    monkeypatch.setattr(EditorSession.__init__, "__defaults__", (checker,))
+
+    with TestClient(create_app(SETTINGS)) as client:
+        with client.websocket_connect("/ws/check") as ws:
+            ws.send_bytes(b"\x00\x01")
+            assert ws.receive_json()["type"] == "error"
+            ws.send_text("not json")
+            assert ws.receive_json()["type"] == "error"
+            ws.send_json({"type": "init", "text": "Hello."})
+            assert ws.receive_json() == {"type": "diff", "version": 1, "added": [], "removed": []}
@@ -0,0 +1,82 @@
+"""
+Startup-time benchmark for the Grammar Check API
+
+Runs in a fresh interpreter so import costs are measured cold, and fails if
+time-to-first-ready exceeds GRAMMAR_STARTUP_BUDGET seconds (default 3.0).
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+STARTUP_BUDGET = float(os.environ.get("GRAMMAR_STARTUP_BUDGET", "3.0"))
+
+# Imports the app, builds it through the factory and serves the first "/"
+# request over raw ASGI, so no HTTP client library is pulled in by the probe.
+PROBE = r"""
+import asyncio, json, sys, time
+
+start = time.perf_counter()
+from app.main import create_app
+from app.config import Settings
+imported = time.perf_counter()
+app = create_app(Settings())
+created = time.perf_counter()
+
+async def first_request():
+    sent = []
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/", "raw_path": b"/",
+        "root_path": "", "query_string": b"", "headers": [],
+        "client": ("127.0.0.1", 0), "server": ("127.0.0.1", 8000),
+    }
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message):
+        sent.append(message)
+    await app(scope, receive, send)
+    return sent[0]["status"]
+
+status = asyncio.run(first_request())
+ready = time.perf_counter()
+
+print(json.dumps({
+    "import": imported - start,
+    "create_app": created - imported,
+    "ready": ready - start,
+    "status": status,
+    "httpx_loaded": "httpx" in sys.modules,
+}))
+"""
+
+
+@pytest.fixture(scope="module")
+def timings() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_time_to_first_ready_within_budget(timings):
+    print(f"\nStartup: import {timings['import']:.3f}s, "
+          f"create_app {timings['create_app']:.3f}s, "
+          f"ready {timings['ready']:.3f}s (budget {STARTUP_BUDGET:.1f}s)")
+
+    assert timings["status"] == 200
+    assert timings["ready"] < STARTUP_BUDGET
+
+
+def test_http_client_is_imported_lazily(timings):
+    assert not timings["httpx_loaded"]
@@ -0,0 +1,159 @@
+"""
+Tests for response formats and compression negotiation
+"""
+
+import asyncio
+import gzip
+
+import pytest
+from starlette.datastructures import Headers
+
+from app.compression import CompressionMiddleware, choose_encoding
+from app.models import GrammarIssue
+from app.wire import COMPACT_JSON, JSON, MSGPACK, from_compact, negotiate_format, to_compact
+
+TEXT = "I goes home. She have a apple. I goes out."
+ISSUES = [
+    GrammarIssue(wrong="I goes", corrected="I go", error_type="verb tense"),
+    GrammarIssue(wrong="She have", corrected="She has", error_type="subject-verb agreement"),
+    GrammarIssue(wrong="I goes", corrected="I go", error_type="verb tense"),
+    GrammarIssue(wrong="a apples", corrected="an apple", error_type="article usage"),
+]
+
+
+def test_compact_round_trip():
+    compact = to_compact(TEXT, ISSUES)
+
+    assert compact["error_types"] == ["verb tense", "subject-verb agreement", "article usage"]
+    assert compact["error_type"] == [0, 1, 0, 2]
+    assert compact["wrong"] == [[0, 6], [13, 21], [31, 37], "a apples"]
+    assert from_compact(TEXT, compact) == ISSUES
+
+
+def test_format_negotiation():
+    assert negotiate_format(None) == JSON
+    assert negotiate_format("*/*") == JSON
+    assert negotiate_format(f"{COMPACT_JSON}, application/json;q=0.5") == COMPACT_JSON
+    assert negotiate_format(f"{COMPACT_JSON};q=0.1, application/json") == JSON
+    assert negotiate_format("text/html") == JSON
+
+
+def test_encoding_negotiation():
+    assert choose_encoding("gzip, br", ["br", "gzip"]) == "br"
+    assert choose_encoding("gzip;q=1, br;q=0.5", ["br", "gzip"]) == "gzip"
+    assert choose_encoding("br", ["gzip"]) is None
+    assert choose_encoding("*", ["gzip"]) == "gzip"
+    assert choose_encoding("gzip;q=0", ["gzip"]) is None
+    assert choose_encoding(None, ["br", "gzip"]) is None
+
+
+def run_middleware(body, accept_encoding="gzip", headers=(), minimum_size=100):
+    async def inner(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json"),
+                                (b"content-length", str(len(body)).encode())] + list(headers)})
+        await send({"type": "http.response.body", "body": body})
+
+    middleware = CompressionMiddleware(inner, minimum_size=minimum_size)
+    middleware.encodings = ["gzip"]
+    scope = {"type": "http", "headers": [(b"accept-encoding", accept_encoding.encode())]}
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    asyncio.run(middleware(scope, receive, send))
+    start, response_body = sent
+    return Headers(raw=start["headers"]), response_body["body"]
+
+
+def test_compresses_at_threshold():
+    body = b"x" * 100
+    headers, compressed = run_middleware(body)
+
+    assert headers["content-encoding"] == "gzip"
+    assert headers["content-length"] == str(len(compressed))
+    assert "Accept-Encoding" in headers["vary"]
+    assert gzip.decompress(compressed) == body
+
+
+def test_identity_response_varies_on_accept_encoding():
+    headers, sent_body = run_middleware(b"x" * 500, accept_encoding="identity")
+
+    assert "content-encoding" not in headers
+    assert "Accept-Encoding" in headers["vary"]
+    assert sent_body == b"x" * 500
+
+
+def test_small_body_passes_through():
+    body = b"x" * 99
+    headers, sent_body = run_middleware(body)
+
+    assert "content-encoding" not in headers
+    assert headers["content-length"] == "99"
+    assert sent_body == body
+
+
+def test_existing_content_encoding_is_left_alone():
+    body = gzip.compress(b"x" * 500)
+    headers, sent_body = run_middleware(body, headers=[(b"content-encoding", b"gzip")], minimum_size=0)
+
+    assert headers.getlist("content-encoding") == ["gzip"]
+    assert sent_body == body
+
+
+def test_websocket_scope_is_untouched():
+    calls = []
+
+    async def inner(scope, receive, send):
+        calls.append((scope, receive, send))
+
+    async def receive():
+        pass
+
+    async def send(message):
+        pass
+
+    scope = {"type": "websocket", "headers": [(b"accept-encoding", b"gzip")]}
+    asyncio.run(CompressionMiddleware(inner, minimum_size=0)(scope, receive, send))
+
+    assert calls == [(scope, receive, send)]
+
+
+def check_client(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import app.main
+    from app.config import Settings
+
+    async def fake_check_grammar(text, settings, timings=None):
+        return ISSUES
+
+    monkeypatch.setattr(app.main, "check_grammar", fake_check_grammar)
+    return TestClient(app.main.create_app(Settings()))
+
+
+def test_check_endpoint_negotiates_json_formats(monkeypatch):
+    with check_client(monkeypatch) as client:
+        default = client.post("/check", json={"text": TEXT})
+        assert default.headers["content-type"] == JSON
+        assert "Accept" in default.headers["vary"]
+        assert default.json() == {"issues": [issue.model_dump() for issue in ISSUES]}
+
+        compact = client.post("/check", json={"text": TEXT}, headers={"Accept": COMPACT_JSON})
+        assert compact.headers["content-type"] == COMPACT_JSON
+        assert "Accept" in compact.headers["vary"]
+        assert compact.json() == to_compact(TEXT, ISSUES)
+
+
+def test_check_endpoint_negotiates_msgpack(monkeypatch):
+    msgpack = pytest.importorskip("msgpack")
+
+    with check_client(monkeypatch) as client:
+        packed = client.post("/check", json={"text": TEXT}, headers={"Accept": MSGPACK})
+        assert packed.headers["content-type"] == MSGPACK
+        assert "Accept" in packed.headers["vary"]
+        assert from_compact(TEXT, msgpack.unpackb(packed.content)) == ISSUES